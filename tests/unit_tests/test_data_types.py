@@ -601,6 +601,28 @@ def test_video_numpy_multi(mock_run):
     assert vid.to_json(run)["path"].endswith(".gif")
 
 
+def test_video_numpy_pads_batch_to_power_of_2(mock_run):
+    video = np.full((3, 10, 3, 28, 28), 255, dtype=np.uint8)
+    vid = wandb.Video(video, format="gif")
+
+    tensor = vid._prepare_video(video)
+
+    # 3 videos are padded to 4, laid out in a 1x4 grid
+    assert tensor.dtype == np.uint8
+    assert tensor.shape == (10, 28, 4 * 28, 3)
+    assert np.all(tensor[:, :, : 3 * 28] == 255)
+    assert np.all(tensor[:, :, 3 * 28 :] == 0)
+
+
+def test_video_torch_requires_grad(mock_run):
+    run = mock_run()
+    video = torch.randint(255, size=(10, 3, 28, 28), dtype=torch.float32)
+    video.requires_grad_()
+    vid = wandb.Video(video, format="gif")
+    vid.bind_to_run(run, "videos", 0)
+    assert vid.to_json(run)["path"].endswith(".gif")
+
+
 def test_video_numpy_invalid():
     video = np.random.random(size=(3, 28, 28))
     with pytest.raises(ValueError):
@@ -1,4 +1,5 @@
 from typing import Iterator
+from unittest import mock
 
 import pytest
 from wandb.proto import wandb_internal_pb2 as pb
@@ -173,3 +174,56 @@ def test_no_operations_text(emulated_terminal, dynamic_progress_printer):
     dynamic_progress_printer.update([pb.PollExitResponse()])
 
     assert emulated_terminal.read_stderr() == ["wandb: ⢿ DEFAULT TEXT"]
+
+
+@pytest.mark.wandb_core_only
+def test_skips_setting_unchanged_text():
+    printer = mock.Mock(spec=p.Printer)
+    printer.supports_unicode = False
+    printer.loading_symbol.return_value = ""
+    text_area = mock.Mock(spec=p.DynamicText)
+    progress_printer = progress.ProgressPrinter(
+        printer,
+        text_area,
+        default_text="DEFAULT TEXT",
+    )
+    stats = pb.OperationStats(
+        total_operations=1,
+        operations=[pb.Operation(desc="op 1", runtime_seconds=45.315)],
+    )
+
+    progress_printer.update(stats)
+    progress_printer.update(stats)
+
+    text_area.set_text.assert_called_once_with("op 1 (45s)")
+
+
+@pytest.mark.skip_wandb_core
+def test_multiple_runs_progress(emulated_terminal, dynamic_progress_printer):
+    dynamic_progress_printer.update(
+        [
+            pb.PollExitResponse(
+                file_counts=pb.FileCounts(
+                    wandb_count=1,
+                    media_count=2,
+                    artifact_count=3,
+                    other_count=4,
+                ),
+                pusher_stats=pb.FilePusherStats(
+                    uploaded_bytes=1 << 20,
+                    total_bytes=4 << 20,
+                ),
+            ),
+            pb.PollExitResponse(
+                file_counts=pb.FileCounts(wandb_count=1),
+                pusher_stats=pb.FilePusherStats(
+                    uploaded_bytes=1 << 20,
+                    total_bytes=4 << 20,
+                ),
+            ),
+        ]
+    )
+
+    assert emulated_terminal.read_stderr() == [
+        "wandb: Processing 2 runs with 11 files (2.00 MB / 8.00 MB)",
+    ]
@@ -8,22 +8,26 @@ For more info, see:
 from __future__ import annotations
 
 import ast
-from collections import defaultdict, deque
-from contextlib import suppress
-from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, ClassVar, Iterable, Iterator
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Collection,
+    Iterable,
+    Iterator,
+    TypeVar,
+)
 
 from ariadne_codegen import Plugin
 from graphlib import TopologicalSorter  # noqa # Run this only with python 3.9+
-from graphql import FragmentDefinitionNode, GraphQLSchema
 
 from .plugin_utils import (
     apply_ruff,
     base_class_names,
-    collect_imported_names,
     imported_names,
-    is_class_def,
     is_import_from,
     is_redundant_subclass_def,
     make_all_assignment,
@@ -32,6 +36,11 @@ from .plugin_utils import (
     remove_module_files,
 )
 
+if TYPE_CHECKING:
+    from graphql import FragmentDefinitionNode, GraphQLSchema
+
+T = TypeVar("T")
+
 DEFAULT_BASE_MODEL_NAME = "BaseModel"  #: The name of the default pydantic base class
 
 # Names of custom-defined types
@@ -55,6 +64,14 @@ TYPING_EXTENSIONS_TYPES = ("override", "Annotated")
 # Misc
 ID = "ID"  #: The GraphQL name of the ID type
 
+#: Import statements to prepend to every generated module (except `__init__`).
+#: These are built once and shared, since they're never modified after creation.
+GENERATED_MODULE_IMPORTS: tuple[ast.ImportFrom, ...] = (
+    make_import_from("__future__", "annotations"),
+    make_import_from("wandb._pydantic", CUSTOM_BASE_IMPORT_NAMES),
+    make_import_from("typing_extensions", TYPING_EXTENSIONS_TYPES),
+)
+
 
 class FixFragmentOrder(Plugin):
     """Plugin to ensure consistent ordering in the fragments module.
@@ -76,19 +93,18 @@ class FixFragmentOrder(Plugin):
         # - imports
         # - class definitions
         # - Model.model_rebuild() statements
-        grouped_stmts: dict[type[ast.stmt], deque[ast.stmt]] = defaultdict(deque)
-        for stmt_type, stmts in groupby(module.body, type):
-            grouped_stmts[stmt_type].extend(stmts)
-
-        imports = grouped_stmts.pop(ast.ImportFrom)
-        class_defs = grouped_stmts.pop(ast.ClassDef)
-
-        # Drop the `.model_rebuild()` statements (we'll regenerate them)
-        _ = grouped_stmts.pop(ast.Expr)
-
-        # Since we've popped all the expected statement groups, verify there's nothing left
-        if grouped_stmts:
-            raise ValueError(f"Unexpected statements in module: {list(grouped_stmts)}")
+        imports: list[ast.ImportFrom] = []
+        class_defs: list[ast.ClassDef] = []
+        for stmt in module.body:
+            if isinstance(stmt, ast.ImportFrom):
+                imports.append(stmt)
+            elif isinstance(stmt, ast.ClassDef):
+                class_defs.append(stmt)
+            elif isinstance(stmt, ast.Expr):
+                # Drop the `.model_rebuild()` statements (we'll regenerate them)
+                continue
+            else:
+                raise ValueError(f"Unexpected statement in module: {type(stmt)}")
 
         # For safety, we're going to apply `.model_rebuild()` to all generated fragment types
         # This'll prevent errors that pop up in pydantic v1 like:
@@ -110,6 +126,11 @@ class FixFragmentOrder(Plugin):
         return module
 
 
+#: Key functions for sorting class definitions and `Class.model_rebuild()` statements
+_class_def_name: Callable[[ast.ClassDef], str] = attrgetter("name")
+_model_rebuild_class_name: Callable[[ast.Expr], str] = attrgetter("value.func.value.id")
+
+
 class ClassDefSorter:
     """A sorter for a collection of class definitions."""
 
@@ -118,7 +139,7 @@ class ClassDefSorter:
         self.toposorter = TopologicalSorter()
 
         # Pre-sort the class definitions to ensure deterministic final topological order
-        for class_def in sorted(class_defs, key=lambda cls: cls.name):
+        for class_def in sorted(class_defs, key=_class_def_name):
             self.toposorter.add(class_def.name, *base_class_names(class_def))
 
         #: The deterministic, topologically sorted order of class definitions
@@ -126,17 +147,18 @@ class ClassDefSorter:
 
     def sort_class_defs(self, class_defs: Iterable[ast.ClassDef]) -> list[ast.ClassDef]:
         """Return the class definitions in topologically sorted order."""
-        return sorted(
-            class_defs,
-            key=lambda class_def: self.static_order.index(class_def.name),
-        )
+        return self._sort_by_name(class_defs, key=_class_def_name)
 
     def sort_model_rebuilds(self, model_rebuilds: Iterable[ast.Expr]) -> list[ast.Expr]:
         """Return the model rebuild statements in topologically sorted order."""
-        return sorted(
-            model_rebuilds,
-            key=lambda expr: self.static_order.index(expr.value.func.value.id),
-        )
+        return self._sort_by_name(model_rebuilds, key=_model_rebuild_class_name)
+
+    def _sort_by_name(self, items: Iterable[T], key: Callable[[T], str]) -> list[T]:
+        """Return the items, placed in a single pass according to the sorted class names."""
+        items_by_name = {key(item): item for item in items}
+        return [
+            items_by_name[name] for name in self.static_order if name in items_by_name
+        ]
 
 
 def forget_default_id_type() -> None:
@@ -165,9 +187,6 @@ class GraphQLCodegenPlugin(Plugin):
     #: Generated classes that we don't need in the final code
     classes_to_drop: set[str]
 
-    #: A NodeTransformer to replace `pydantic.BaseModel` with `GQLBase`
-    _pydantic_model_rewriter: PydanticClassRewriter
-
     # From ariadne-codegen, we don't currently need the generated httpx client,
     # exceptions, etc., so drop these generated modules in favor of
     # the existing internal GQL client.
@@ -197,8 +216,6 @@ class GraphQLCodegenPlugin(Plugin):
         if ID in codegen_config["scalars"]:
             forget_default_id_type()
 
-        self._pydantic_model_rewriter = PydanticClassRewriter()
-
     def generate_init_code(self, generated_code: str) -> str:
         # This should be the last hook in the codegen process, after all modules have been generated.
         # So at this step, perform cleanup like ...
@@ -229,36 +246,19 @@ class GraphQLCodegenPlugin(Plugin):
             f.name.value: f.type_condition.name.value
             for f in fragments_definitions.values()
         }
+        return self._rewrite_generated_module(module, typenames=fragment2typename)
 
-        # Rewrite `typename__` fields:
-        #   - BEFORE: `typename__: str = Field(alias="__typename")`
-        #   - AFTER:  `typename__: Literal["OrigSchemaTypeName"] = "OrigSchemaTypeName"`
-        for class_def in filter(is_class_def, module.body):
-            for stmt in class_def.body:
-                if (
-                    isinstance(stmt, ast.AnnAssign)
-                    and (stmt.target.id == "typename__")
-                    and (typename := fragment2typename.get(class_def.name))
-                ):
-                    stmt.annotation = ast.Subscript(
-                        value=ast.Name(id="Literal"),
-                        slice=ast.Constant(value=typename),
-                    )
-                    stmt.value = ast.Constant(value=typename)
-
-        module = self._rewrite_generated_module(module)
-        return ast.fix_missing_locations(module)
-
-    def _rewrite_generated_module(self, module: ast.Module) -> ast.Module:
+    def _rewrite_generated_module(
+        self,
+        module: ast.Module,
+        typenames: dict[str, str] | None = None,
+    ) -> ast.Module:
         """Apply common transformations to the generated module, excluding `__init__`."""
-        self._prepend_statements(
-            module,
-            make_import_from("__future__", "annotations"),
-            make_import_from("wandb._pydantic", CUSTOM_BASE_IMPORT_NAMES),
-            make_import_from("typing_extensions", TYPING_EXTENSIONS_TYPES),
-        )
-        module = self._pydantic_model_rewriter.visit(module)
-        module = self._replace_redundant_classes(module)
+        self._prepend_statements(module, *GENERATED_MODULE_IMPORTS)
+        class_name_replacements = self._find_redundant_classes(module)
+        module = GeneratedClassRewriter(
+            class_name_replacements, typenames=typenames
+        ).visit(module)
         module = self._fix_typing_imports(module)
         return ast.fix_missing_locations(module)
 
@@ -268,8 +268,8 @@ class GraphQLCodegenPlugin(Plugin):
         """Modify the module in-place by prepending the given statements."""
         module.body = [*stmts, *module.body]
 
-    def _replace_redundant_classes(self, module: ast.Module) -> ast.Module:
-        # Identify redundant classes and build replacement mapping
+    def _find_redundant_classes(self, module: ast.Module) -> dict[str, str]:
+        """Return a mapping of {redundant subclass name -> parent class name}."""
         redundant_class_defs = filter(is_redundant_subclass_def, module.body)
 
         class_name_replacements = {
@@ -280,24 +280,23 @@ class GraphQLCodegenPlugin(Plugin):
 
         # Record removed classes for later cleanup
         self.classes_to_drop.update(class_name_replacements.keys())
-
-        # Update any references to redundant classes in the remaining class definitions
-        # Replace the module body with the cleaned-up statements
-        return RedundantClassReplacer(class_name_replacements).visit(module)
+        return class_name_replacements
 
     def _cleanup_init_module(self, module: ast.Module) -> ast.Module:
         """Remove dropped imports and rewrite `__all__` exports in `__init__`."""
-        # Drop selected import statements from the __init__ module
-        kept_import_stmts = list(
-            self._filter_init_imports(
-                module.body,
-                omit_modules=self.modules_to_drop,
-                omit_names=self.classes_to_drop,
-            )
-        )
+        # Drop selected import statements from the __init__ module,
+        # collecting the names to export from the kept imports as we go
+        kept_import_stmts: list[ast.ImportFrom] = []
+        names_to_export: list[str] = []
+        for stmt in self._filter_init_imports(
+            module.body,
+            omit_modules=self.modules_to_drop,
+            omit_names=self.classes_to_drop,
+        ):
+            kept_import_stmts.append(stmt)
+            names_to_export.extend(imported_names(stmt))
 
         # Replace the `__all__ = [...]` export statement
-        names_to_export = collect_imported_names(kept_import_stmts)
         export_stmt = make_all_assignment(names_to_export)
 
         # Update the module with the cleaned-up statements
@@ -307,8 +306,8 @@ class GraphQLCodegenPlugin(Plugin):
     @staticmethod
     def _filter_init_imports(
         stmts: Iterable[ast.stmt],
-        omit_modules: Iterable[str],
-        omit_names: Iterable[str],
+        omit_modules: Collection[str],
+        omit_names: Collection[str],
     ) -> Iterator[ast.ImportFrom]:
         """Yield only import statements to keep from the given module statements."""
         import_from_stmts = (
@@ -317,11 +316,12 @@ class GraphQLCodegenPlugin(Plugin):
             # Ignore imports from modules that are being dropped
             if is_import_from(stmt) and (stmt.module not in omit_modules)
         )
-        excluded_names = set(omit_names)
         for stmt in import_from_stmts:
             # Keep only imported names that aren't being dropped
-            kept_names = sorted(set(imported_names(stmt)) - excluded_names)
-            yield make_import_from(stmt.module, kept_names, level=stmt.level)
+            kept_names = set(imported_names(stmt))
+            if omit_names:
+                kept_names.difference_update(omit_names)
+            yield make_import_from(stmt.module, sorted(kept_names), level=stmt.level)
 
     @staticmethod
     def _fix_typing_imports(module: ast.Module) -> ast.Module:
@@ -334,15 +334,61 @@ def _filter_and_fix_typing_imports(stmts: Iterable[ast.stmt]) -> Iterator[ast.st
     for stmt in stmts:
         if is_import_from(stmt) and (stmt.module == "typing"):
             # Drop typing imports that must be imported from typing_extensions
-            if kept_names := (set(imported_names(stmt)) - set(TYPING_EXTENSIONS_TYPES)):
+            if kept_names := [
+                name
+                for name in imported_names(stmt)
+                if name not in TYPING_EXTENSIONS_TYPES
+            ]:
                 yield make_import_from(stmt.module, kept_names)
         else:
             # Keep all non-typing import statements and any other statements
             yield stmt
 
 
-class PydanticClassRewriter(ast.NodeTransformer):
-    """Replaces all `pydantic.BaseModel` base classes with `GQLBase`."""
+class _DispatchingTransformer(ast.NodeTransformer):
+    """A NodeTransformer that looks up its `visit_*` methods once, up front.
+
+    The default `NodeVisitor.visit()` does a `getattr(self, "visit_" + ...)` for every
+    node, which adds up when rewriting large generated modules.
+    """
+
+    def __init__(self) -> None:
+        #: Maps AST node types -> the bound `visit_*` method that handles them
+        self._visitors: dict[type[ast.AST], Callable[[Any], Any]] = {
+            getattr(ast, name.removeprefix("visit_")): getattr(self, name)
+            for name in dir(self)
+            if name.startswith("visit_") and hasattr(ast, name.removeprefix("visit_"))
+        }
+
+    def visit(self, node: ast.AST) -> Any:
+        return self._visitors.get(type(node), self.generic_visit)(node)
+
+
+class GeneratedClassRewriter(_DispatchingTransformer):
+    """Rewrites the generated pydantic classes in a single pass over the module.
+
+    This:
+    - replaces all `pydantic.BaseModel` base classes with `GQLBase`
+    - removes redundant class definitions and replaces references to them
+    """
+
+    #: Maps deleted class names -> replacement class names
+    replacement_names: dict[str, str]
+    #: Maps class names -> original schema type names, for pinning `typename__` fields
+    typenames: dict[str, str]
+
+    #: The name of the class definition currently being visited, if any
+    _class_name: str | None
+
+    def __init__(
+        self,
+        replacement_names: dict[str, str],
+        typenames: dict[str, str] | None = None,
+    ):
+        super().__init__()
+        self.replacement_names = replacement_names
+        self.typenames = typenames or {}
+        self._class_name = None
 
     def visit_ImportFrom(self, node: ast.ImportFrom) -> ast.ImportFrom | None:
         # Drop imports of the pydantic.BaseModel class
@@ -355,6 +401,17 @@ class PydanticClassRewriter(ast.NodeTransformer):
 
     def visit_AnnAssign(self, node: ast.AnnAssign) -> ast.AnnAssign:
         if node.target.id == "typename__":
+            # If the original schema type is known, pin the field to it, e.g.
+            #   - BEFORE: `typename__: str = Field(alias="__typename")`
+            #   - AFTER:  `typename__: Literal["OrigSchemaTypeName"] = "OrigSchemaTypeName"`
+            if typename := self.typenames.get(self._class_name):
+                typename_const = ast.Constant(value=typename)
+                node.annotation = ast.Subscript(
+                    value=ast.Name(id="Literal"),
+                    slice=typename_const,
+                )
+                node.value = typename_const
+
             # e.g. BEFORE: `typename__: Literal["MyType"] = Field(alias="__typename")`
             # e.g. AFTER:  `typename__: Typename[Literal["MyType"]]`
             node.annotation = ast.Subscript(  # T -> Typename[T]
@@ -386,32 +443,34 @@ class PydanticClassRewriter(ast.NodeTransformer):
 
         return self.generic_visit(node)
 
-    def visit_Name(self, node: ast.Name) -> ast.Name:
-        """Visit the name of a base class in a class definition."""
-        # Replace the default pydantic.BaseModel with our custom base class
-        if node.id == DEFAULT_BASE_MODEL_NAME:
-            node.id = CUSTOM_GQL_BASE_MODEL_NAME
-        return self.generic_visit(node)
-
-
-class RedundantClassReplacer(ast.NodeTransformer):
-    """Removes redundant class definitions and references to them."""
-
-    #: Maps deleted class names -> replacement class names
-    replacement_names: dict[str, str]
-
-    def __init__(self, replacement_names: dict[str, str]):
-        self.replacement_names = replacement_names
-
     def visit_ClassDef(self, node: ast.ClassDef) -> ast.ClassDef:
         if node.name in self.replacement_names:
             return None
-        return self.generic_visit(node)
+        self._class_name = node.name
+
+        # Only the base classes and body of a generated class need rewriting, so visit
+        # just those instead of via `generic_visit()`, which rebuilds every field.
+        # Like `generic_visit()`, drop any nodes that a visitor removes.
+        node.bases = [
+            new for base in node.bases if (new := self.visit(base)) is not None
+        ]
+        node.body = [new for stmt in node.body if (new := self.visit(stmt)) is not None]
+        return node
 
     def visit_Name(self, node: ast.Name) -> ast.Name:
         # node.id may be the name of the hinted type, e.g. `MyType`
         # or an implicit forward ref, e.g. `"MyType"`, `'MyType'`
-        unquoted_name = node.id.strip("'\"")
-        with suppress(LookupError):
-            node.id = self.replacement_names[unquoted_name]
-        return self.generic_visit(node)
+        name = node.id
+        if len(name) >= 2 and name[0] in "'\"" and name[-1] == name[0]:
+            unquoted_name = name[1:-1]
+        else:
+            unquoted_name = name
+        if (replacement_name := self.replacement_names.get(unquoted_name)) is not None:
+            node.id = replacement_name
+
+        # Replace the default pydantic.BaseModel with our custom base class.
+        # Do this after replacing redundant classes, in case a redundant class
+        # was a direct subclass of pydantic.BaseModel.
+        if node.id == DEFAULT_BASE_MODEL_NAME:
+            node.id = CUSTOM_GQL_BASE_MODEL_NAME
+        return node  # A name has no children (besides its `ctx`) to rewrite
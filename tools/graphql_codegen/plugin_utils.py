@@ -5,7 +5,6 @@ from __future__ import annotations
 import ast
 import subprocess
 import sys
-from itertools import chain
 from pathlib import Path
 from typing import TYPE_CHECKING, Iterable
 
@@ -22,6 +21,12 @@ def remove_module_files(root: Path, module_names: Iterable[str]) -> None:
 
 
 def apply_ruff(path: str | Path) -> None:
+    """Apply lint fixes, then formatting, to the generated code at the given path.
+
+    Note: this deliberately runs Ruff once over the whole directory, in the foreground.
+    Ruff already parallelizes across files internally, formatting needs to run
+    after the fixes, and both need all generated modules to be written first.
+    """
     path = str(path)
     sys.stdout.write(f"\n========== Reformatting: {path} ==========\n")
     subprocess.run(["ruff", "check", "--fix", "--unsafe-fixes", path], check=True)
@@ -35,7 +40,12 @@ def imported_names(stmt: ast.Import | ast.ImportFrom) -> list[str]:
 
 def base_class_names(class_def: ast.ClassDef) -> list[str]:
     """Return the (str) names of the base classes of this class definition."""
-    return [base.id for base in class_def.bases]
+    # Generated base classes are almost always simple names, e.g. `MyBase`,
+    # so only fall back to `ast.unparse()` for anything else, e.g. `module.MyBase`.
+    return [
+        base.id if isinstance(base, ast.Name) else ast.unparse(base)
+        for base in class_def.bases
+    ]
 
 
 def is_redundant_subclass_def(stmt: ast.ClassDef) -> TypeGuard[ast.ClassDef]:
@@ -113,11 +123,6 @@ def make_model_rebuild(class_name: str) -> ast.Expr:
     )
 
 
-def collect_imported_names(stmts: Iterable[ast.ImportFrom]) -> list[str]:
-    """Return the names to export from the __init__ module by parsing the import statements."""
-    return list(chain.from_iterable(imported_names(stmt) for stmt in stmts))
-
-
 def make_all_assignment(names: Iterable[str]) -> ast.Assign:
     """Generate an `__all__ = [...]` statement to export the given names from __init__.py."""
     return make_assign(
@@ -1,6 +1,7 @@
 import functools
 import logging
 import os
+import shutil
 from io import BytesIO
 from typing import TYPE_CHECKING, Any, Literal, Optional, Sequence, Type, Union
 
@@ -128,7 +129,7 @@ class Video(BatchableMedia):
                 MEDIA_TMP.name, runid.generate_id() + "." + self._format
             )
             with open(filename, "wb") as f:
-                f.write(data_or_path.read())
+                shutil.copyfileobj(data_or_path, f, 1 << 20)
             self._set_file(filename, is_tmp=True)
         elif isinstance(data_or_path, str):
             _, ext = os.path.splitext(data_or_path)
@@ -140,7 +141,10 @@ class Video(BatchableMedia):
             self._set_file(data_or_path, is_tmp=False)
             # ffprobe -v error -select_streams v:0 -show_entries stream=width,height -of csv=p=0 data_or_path
         else:
-            if hasattr(data_or_path, "numpy"):  # TF data eager tensors
+            if util.is_pytorch_tensor_typename(util.get_full_typename(data_or_path)):
+                # `.numpy()` fails for tensors on the GPU or that require grad
+                self.data = data_or_path.detach().cpu().numpy()
+            elif hasattr(data_or_path, "numpy"):  # TF data eager tensors
                 self.data = data_or_path.numpy()
             elif util.is_numpy_array(data_or_path):
                 self.data = data_or_path
@@ -208,27 +212,25 @@ class Video(BatchableMedia):
             video = video.reshape(1, *video.shape)
         b, t, c, h, w = video.shape
 
+        # The data is converted while it's copied into the grid below,
+        # which avoids making a separate uint8 copy of the whole batch.
         if video.dtype != np.uint8:
             logging.warning("Converting video data to uint8")
-            video = video.astype(np.uint8)
-
-        def is_power2(num: int) -> bool:
-            return num != 0 and ((num & (num - 1)) == 0)
-
-        # pad to nearest power of 2, all at once
-        if not is_power2(video.shape[0]):
-            len_addition = int(2 ** video.shape[0].bit_length() - video.shape[0])
-            video = np.concatenate(
-                (video, np.zeros(shape=(len_addition, t, c, h, w))), axis=0
-            )
 
+        # lay out the videos in a grid, padded to the nearest power of 2 cells
+        n_cells = 1 << (b - 1).bit_length()
         n_rows = 2 ** ((b.bit_length() - 1) // 2)
-        n_cols = video.shape[0] // n_rows
-
-        video = video.reshape(n_rows, n_cols, t, c, h, w)
-        video = np.transpose(video, axes=(2, 0, 4, 1, 5, 3))
-        video = video.reshape(t, n_rows * h, n_cols * w, c)
-        return video
+        n_cols = n_cells // n_rows
+
+        # copy each video straight into its cell of the grid, leaving any
+        # padding cells black
+        grid = np.zeros(shape=(t, n_rows * h, n_cols * w, c), dtype=np.uint8)
+        for i in range(b):
+            row, col = divmod(i, n_cols)
+            grid[:, row * h : (row + 1) * h, col * w : (col + 1) * w, :] = np.transpose(
+                video[i], axes=(0, 2, 3, 1)
+            )
+        return grid
 
     @classmethod
     def seq_to_json(
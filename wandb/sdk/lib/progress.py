@@ -114,6 +114,8 @@ class ProgressPrinter:
         self._default_text = default_text
         self._tick = 0
         self._last_printed_line = ""
+        self._last_single_run_line: tuple[tuple[int, ...], str] | None = None
+        self._last_multiple_runs_line: tuple[tuple[int, ...], str] | None = None
 
     def update(
         self,
@@ -138,13 +140,17 @@ class ProgressPrinter:
 
     def _update_operation_stats(self, stats_list: list[pb.OperationStats]) -> None:
         if self._progress_text_area:
-            _DynamicOperationStatsPrinter(
+            text = _DynamicOperationStatsPrinter(
                 self._printer,
-                self._progress_text_area,
                 max_lines=6,
                 loading_symbol=self._printer.loading_symbol(self._tick),
                 default_text=self._default_text,
-            ).display(stats_list)
+            ).render(stats_list)
+
+            if text != self._last_printed_line:
+                self._progress_text_area.set_text(text)
+
+            self._last_printed_line = text
 
         else:
             top_level_operations: list[str] = []
@@ -170,13 +176,21 @@ class ProgressPrinter:
         progress: pb.PollExitResponse,
     ) -> None:
         stats = progress.pusher_stats
-        line = (
-            f"{_megabytes(stats.uploaded_bytes):.3f} MB"
-            f" of {_megabytes(stats.total_bytes):.3f} MB uploaded"
-        )
 
-        if stats.deduped_bytes > 0:
-            line += f" ({_megabytes(stats.deduped_bytes):.3f} MB deduped)"
+        # Reuse the last line if the byte counts haven't changed.
+        key = (stats.uploaded_bytes, stats.total_bytes, stats.deduped_bytes)
+        if self._last_single_run_line and self._last_single_run_line[0] == key:
+            line = self._last_single_run_line[1]
+        else:
+            line = (
+                f"{_megabytes(stats.uploaded_bytes):.3f} MB"
+                f" of {_megabytes(stats.total_bytes):.3f} MB uploaded"
+            )
+
+            if stats.deduped_bytes > 0:
+                line += f" ({_megabytes(stats.deduped_bytes):.3f} MB deduped)"
+
+            self._last_single_run_line = (key, line)
 
         if stats.total_bytes > 0:
             self._update_progress_text(
@@ -195,19 +209,30 @@ class ProgressPrinter:
         total_bytes = 0
 
         for progress in progress_list:
-            total_files += progress.file_counts.wandb_count
-            total_files += progress.file_counts.media_count
-            total_files += progress.file_counts.artifact_count
-            total_files += progress.file_counts.other_count
-
-            uploaded_bytes += progress.pusher_stats.uploaded_bytes
-            total_bytes += progress.pusher_stats.total_bytes
-
-        line = (
-            f"Processing {len(progress_list)} runs with {total_files} files"
-            f" ({_megabytes(uploaded_bytes):.2f} MB"
-            f" / {_megabytes(total_bytes):.2f} MB)"
-        )
+            file_counts = progress.file_counts
+            total_files += (
+                file_counts.wandb_count
+                + file_counts.media_count
+                + file_counts.artifact_count
+                + file_counts.other_count
+            )
+
+            pusher_stats = progress.pusher_stats
+            uploaded_bytes += pusher_stats.uploaded_bytes
+            total_bytes += pusher_stats.total_bytes
+
+        # Totals rarely change between polls, so reuse the last line
+        # instead of formatting it again.
+        key = (len(progress_list), total_files, uploaded_bytes, total_bytes)
+        if self._last_multiple_runs_line and self._last_multiple_runs_line[0] == key:
+            line = self._last_multiple_runs_line[1]
+        else:
+            line = (
+                f"Processing {len(progress_list)} runs with {total_files} files"
+                f" ({_megabytes(uploaded_bytes):.2f} MB"
+                f" / {_megabytes(total_bytes):.2f} MB)"
+            )
+            self._last_multiple_runs_line = (key, line)
 
         if total_bytes > 0:
             self._update_progress_text(line, uploaded_bytes / total_bytes)
@@ -226,18 +251,16 @@ class ProgressPrinter:
 
 
 class _DynamicOperationStatsPrinter:
-    """Single-use object that writes operation stats into a text area."""
+    """Single-use object that renders operation stats for a text area."""
 
     def __init__(
         self,
         printer: p.Printer,
-        text_area: p.DynamicText,
         max_lines: int,
         loading_symbol: str,
         default_text: str,
     ) -> None:
         self._printer = printer
-        self._text_area = text_area
         self._max_lines = max_lines
         self._loading_symbol = loading_symbol
         self._default_text = default_text
@@ -245,15 +268,24 @@ class _DynamicOperationStatsPrinter:
         self._lines: list[str] = []
         self._ops_shown = 0
 
-    def display(
+        # Line prefixes: the loading symbol, and for subtasks, a subtask indicator.
+        self._op_prefix = f"{loading_symbol} " if loading_symbol else ""
+        if printer.supports_unicode:
+            self._subtask_prefix = f"↳ {self._op_prefix}"
+        else:
+            self._subtask_prefix = self._op_prefix
+
+    def render(
         self,
         stats_list: Iterable[pb.OperationStats],
-    ) -> None:
-        """Show the given stats in the text area."""
+    ) -> str:
+        """Returns the text to show in the text area for the given stats."""
         total_operations = 0
         for stats in stats_list:
             for op in stats.operations:
-                self._add_operation(op, is_subtask=False, indent="")
+                if len(self._lines) >= self._max_lines:
+                    break
+                self._add_operation(op)
             total_operations += stats.total_operations
 
         if self._ops_shown < total_operations:
@@ -266,58 +298,47 @@ class _DynamicOperationStatsPrinter:
 
         if len(self._lines) == 0:
             if self._loading_symbol:
-                self._text_area.set_text(f"{self._loading_symbol} {self._default_text}")
+                return f"{self._loading_symbol} {self._default_text}"
             else:
-                self._text_area.set_text(self._default_text)
+                return self._default_text
         else:
-            self._text_area.set_text("\n".join(self._lines))
-
-    def _add_operation(self, op: pb.Operation, is_subtask: bool, indent: str) -> None:
-        """Add the operation to `self._lines`."""
-        if len(self._lines) >= self._max_lines:
-            return
+            return "\n".join(self._lines)
 
-        if not is_subtask:
-            self._ops_shown += 1
+    def _add_operation(self, op: pb.Operation) -> None:
+        """Add the top-level operation and its subtasks to `self._lines`."""
+        # Visit the operation tree depth-first, without recursion.
+        # Each entry is (operation, is_subtask, indent).
+        stack: list[tuple[pb.Operation, bool, str]] = [(op, False, "")]
 
-        parts = []
+        while stack and len(self._lines) < self._max_lines:
+            op, is_subtask, indent = stack.pop()
 
-        # Subtask indicator.
-        if is_subtask and self._printer.supports_unicode:
-            parts.append("↳")
+            if not is_subtask:
+                self._ops_shown += 1
 
-        # Loading symbol.
-        if self._loading_symbol:
-            parts.append(self._loading_symbol)
+            prefix = self._subtask_prefix if is_subtask else self._op_prefix
 
-        # Task name.
-        parts.append(op.desc)
+            # Progress information.
+            progress = f" {op.progress}" if op.progress else ""
 
-        # Progress information.
-        if op.progress:
-            parts.append(f"{op.progress}")
+            # Task name, progress and duration.
+            runtime = _time_to_string(seconds=op.runtime_seconds)
+            self._lines.append(f"{indent}{prefix}{op.desc}{progress} ({runtime})")
 
-        # Task duration.
-        parts.append(f"({_time_to_string(seconds=op.runtime_seconds)})")
-
-        # Error status.
-        self._lines.append(indent + " ".join(parts))
-        if op.error_status:
-            error_word = self._printer.error("ERROR")
-            error_desc = self._printer.secondary_text(op.error_status)
-            subtask_indent = "  " if is_subtask else ""
-            self._lines.append(
-                f"{indent}{subtask_indent}  {error_word} {error_desc}",
-            )
+            # Error status.
+            if op.error_status:
+                error_word = self._printer.error("ERROR")
+                error_desc = self._printer.secondary_text(op.error_status)
+                subtask_indent = "  " if is_subtask else ""
+                self._lines.append(
+                    f"{indent}{subtask_indent}  {error_word} {error_desc}",
+                )
 
-        # Subtasks.
-        if op.subtasks:
-            subtask_indent = indent + "  "
-            for task in op.subtasks:
-                self._add_operation(
-                    task,
-                    is_subtask=True,
-                    indent=subtask_indent,
+            # Subtasks, pushed in reverse so that they're shown in order.
+            if op.subtasks:
+                subtask_indent = indent + "  "
+                stack.extend(
+                    (task, True, subtask_indent) for task in reversed(op.subtasks)
                 )
 
 
@@ -331,11 +352,15 @@ def _time_to_string(seconds: float) -> str:
         minutes = seconds / 60
         return f"{minutes:.1f}m"
 
-    hours = int(seconds / (60 * 60))
-    minutes = int((seconds / 60) % 60)
+    hours, remaining_seconds = divmod(int(seconds), 60 * 60)
+    minutes = remaining_seconds // 60
     return f"{hours}h{minutes}m"
 
 
+_BYTES_TO_MEGABYTES = 1 / (1 << 20)
+"""The number of megabytes in a byte (exact, since it's a power of two)."""
+
+
 def _megabytes(bytes: int) -> float:
     """Returns the number of megabytes in `bytes`."""
-    return bytes / (1 << 20)
+    return bytes * _BYTES_TO_MEGABYTES